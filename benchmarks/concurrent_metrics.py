@@ -0,0 +1,63 @@
+"""
+Compare `ConcurrentMetrics` against a `Metrics` instance guarded by a global lock.
+
+Usage (from the root of the repository): python -m benchmarks.concurrent_metrics [--updates N]
+Scaling across threads is only expected on free-threaded Python builds with multiple cores.
+"""
+
+import argparse
+import sys
+import threading
+import time
+
+from trainlib.metrics import ConcurrentMetrics, Metric, Metrics
+
+
+def run_locked(num_threads, num_updates):
+    lock = threading.Lock()
+    state = {'metrics': Metrics()}
+
+    def work():
+        for _ in range(num_updates):
+            metric = Metric('loss', 1.0, 1)
+            with lock:
+                state['metrics'] = state['metrics'] + metric
+
+    return _time(work, num_threads)
+
+
+def run_sharded(num_threads, num_updates):
+    metrics = ConcurrentMetrics()
+
+    def work():
+        for _ in range(num_updates):
+            metrics.add(Metric('loss', 1.0, 1))
+
+    elapsed = _time(work, num_threads)
+    assert metrics.snapshot().loss.value == num_threads * num_updates
+    return elapsed
+
+
+def _time(work, num_threads):
+    threads = [threading.Thread(target=work) for _ in range(num_threads)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--updates', type=int, default=20000, help='Number of updates per thread.')
+    args = parser.parse_args()
+
+    gil = getattr(sys, '_is_gil_enabled', lambda: True)()
+    print(f'GIL enabled: {gil}')
+    print(f'{"threads":>8} {"locked (upd/s)":>16} {"sharded (upd/s)":>16}')
+    for num_threads in [1, 2, 4, 8]:
+        total = num_threads * args.updates
+        locked = total / run_locked(num_threads, args.updates)
+        sharded = total / run_sharded(num_threads, args.updates)
+        print(f'{num_threads:>8} {locked:>16.0f} {sharded:>16.0f}')
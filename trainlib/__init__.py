@@ -1,5 +1,6 @@
+from .accounting import FlopAccountant, get_num_params, measure_peak_flops
 from .logger import create_logger, log_this
-from .metrics import Metric, Metrics
+from .metrics import ConcurrentMetrics, Metric, Metrics
 from .tracker.tracker import Task, Tracker
 from .trainer import (Trainer, get_grad_norm, get_trainable_params,
                       set_random_seeds)
@@ -0,0 +1,125 @@
+"""
+Parameter and FLOP accounting for modules, with achieved throughput reported as `Metrics`.
+"""
+
+from __future__ import annotations
+
+import time
+from typing import Dict, Hashable, Tuple
+
+import torch
+from torch.utils.flop_counter import FlopCounterMode
+
+from .metrics import Metric, Metrics
+from .trainer import get_trainable_params
+
+
+def get_num_params(mod: torch.nn.Module) -> Tuple[int, int]:
+    """Return the numbers of trainable and total parameters."""
+    num_trainable = sum(param.numel() for param in get_trainable_params(mod, named=False))
+    num_total = sum(param.numel() for param in mod.parameters())
+    return num_trainable, num_total
+
+
+def measure_peak_flops(size: int = 1024, repeat: int = 10) -> float:
+    """Measure peak FLOPs/sec of this CPU with float32 matrix multiplications."""
+    x = torch.randn(size, size)
+    y = torch.randn(size, size)
+    torch.mm(x, y)  # Warm up.
+    start = time.perf_counter()
+    for _ in range(repeat):
+        torch.mm(x, y)
+    elapsed = time.perf_counter() - start
+    return 2 * size ** 3 * repeat / elapsed
+
+
+def _get_signature(mod: torch.nn.Module, args, kwargs) -> Hashable:
+
+    def describe(value):
+        if isinstance(value, torch.Tensor):
+            return ('tensor', tuple(value.shape), value.dtype, value.requires_grad)
+        if isinstance(value, (list, tuple)):
+            return tuple(describe(v) for v in value)
+        if isinstance(value, dict):
+            return tuple((k, describe(v)) for k, v in sorted(value.items()))
+        # Scalars often decide how much computation is run.
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        return type(value)
+
+    requires_grad = tuple(param.requires_grad for param in mod.parameters())
+    return (mod.training, torch.is_grad_enabled(), requires_grad, describe(args), describe(kwargs))
+
+
+def _get_tensors(value):
+    if isinstance(value, torch.Tensor):
+        yield value
+    elif isinstance(value, (list, tuple)):
+        for v in value:
+            yield from _get_tensors(v)
+    elif isinstance(value, dict):
+        for v in value.values():
+            yield from _get_tensors(v)
+
+
+class FlopAccountant:
+    """
+    Count parameters and FLOPs of a module, and report achieved FLOPs/sec for timed steps.
+
+    FLOPs of one forward and one backward pass are profiled once per model signature (training mode, whether grad
+    is enabled, which parameters require grad, shapes and dtypes of tensor inputs, and values of scalar inputs)
+    and cached afterwards.
+    If `peak_flops` is not provided, it is measured on CPU with `measure_peak_flops`.
+    """
+
+    def __init__(self, mod: torch.nn.Module, *, peak_flops: float = None):
+        self.mod = mod
+        self.peak_flops = peak_flops or measure_peak_flops()
+        self._cache: Dict[Hashable, Tuple[int, int]] = dict()
+
+    def count_flops(self, *args, **kwargs) -> Tuple[int, int]:
+        """Return the FLOPs of one forward pass and one backward pass on these inputs."""
+        signature = _get_signature(self.mod, args, kwargs)
+        if signature not in self._cache:
+            self._cache[signature] = self._profile(*args, **kwargs)
+        return self._cache[signature]
+
+    def _profile(self, *args, **kwargs) -> Tuple[int, int]:
+        # NOTE(j_luo) Profiling runs an extra forward and backward pass. To keep it from interfering with training,
+        # buffers (e.g., BatchNorm statistics) and the RNG state are restored afterwards, and gradients are computed
+        # with `torch.autograd.grad` so that `.grad` is never touched.
+        buffers = [(buf, buf.clone()) for buf in self.mod.buffers()]
+        try:
+            with torch.random.fork_rng(devices=[]):
+                with FlopCounterMode(display=False) as counter:
+                    out = self.mod(*args, **kwargs)
+                fwd_flops = counter.get_total_flops()
+
+                bwd_flops = 0
+                outputs = [t.sum() for t in _get_tensors(out) if t.requires_grad]
+                params = list(get_trainable_params(self.mod, named=False))
+                if outputs and params:
+                    with FlopCounterMode(display=False) as counter:
+                        torch.autograd.grad(outputs, params, allow_unused=True)
+                    bwd_flops = counter.get_total_flops()
+        finally:
+            with torch.no_grad():
+                for buf, saved in buffers:
+                    buf.copy_(saved)
+        return fwd_flops, bwd_flops
+
+    def get_metrics(self, elapsed: float, args: tuple = (), kwargs: dict = None, *,
+                    include_backward: bool = True) -> Metrics:
+        """
+        Return `Metrics` for one step that took `elapsed` seconds on inputs `args` and `kwargs` to the module.
+        `flops_per_sec` and `utilization` are weighted by time so that they can be accumulated across steps.
+        Parameter counts are weighted by one so that their means stay the same after accumulation.
+        """
+        num_trainable, num_total = get_num_params(self.mod)
+        fwd_flops, bwd_flops = self.count_flops(*args, **(kwargs or dict()))
+        flops = fwd_flops + bwd_flops if include_backward else fwd_flops
+        return Metrics(Metric('num_trainable_params', num_trainable, 1),
+                       Metric('num_params', num_total, 1),
+                       Metric('flops', flops, 0, report_mean=False),
+                       Metric('flops_per_sec', flops, elapsed),
+                       Metric('utilization', flops / self.peak_flops, elapsed))
@@ -0,0 +1,85 @@
+from unittest import TestCase
+
+import torch
+
+from .accounting import FlopAccountant, get_num_params
+
+
+class TestFlopAccountant(TestCase):
+
+    def setUp(self):
+        self.mod = torch.nn.Linear(8, 4, bias=False)
+        self.accountant = FlopAccountant(self.mod, peak_flops=1e9)
+
+    def test_num_params(self):
+        self.mod.weight.requires_grad_(False)
+        self.assertEqual(get_num_params(self.mod), (0, 32))
+
+    def test_count_flops(self):
+        x = torch.randn(2, 8)
+        fwd_flops, bwd_flops = self.accountant.count_flops(x)
+        self.assertEqual(fwd_flops, 2 * 2 * 8 * 4)
+        self.assertEqual(bwd_flops, 2 * 2 * 8 * 4)
+        self.assertIsNone(self.mod.weight.grad)
+        self.assertEqual(len(self.accountant._cache), 1)
+
+        self.accountant.count_flops(torch.randn(2, 8))
+        self.assertEqual(len(self.accountant._cache), 1)
+        self.accountant.count_flops(torch.randn(3, 8))
+        self.assertEqual(len(self.accountant._cache), 2)
+
+    def test_get_metrics(self):
+        x = torch.randn(2, 8)
+        metrics = self.accountant.get_metrics(0.5, (x, )) + self.accountant.get_metrics(1.5, (x, ))
+        self.assertEqual(metrics.flops.total, 2 * 128)
+        self.assertAlmostEqual(metrics.flops_per_sec.mean, 128)
+        self.assertAlmostEqual(metrics.utilization.mean, 128 / 1e9)
+        self.assertEqual(metrics.num_params.mean, 32)
+
+    def test_existing_grads(self):
+        grad = torch.ones_like(self.mod.weight)
+        self.mod.weight.grad = grad.clone()
+        self.accountant.count_flops(torch.randn(2, 8))
+        self.assertTrue(torch.equal(self.mod.weight.grad, grad))
+
+    def test_no_side_effects(self):
+        mod = torch.nn.Sequential(torch.nn.Linear(8, 4), torch.nn.BatchNorm1d(4), torch.nn.Dropout(0.5))
+        accountant = FlopAccountant(mod, peak_flops=1e9)
+        running_mean = mod[1].running_mean.clone()
+        rng_state = torch.get_rng_state()
+        accountant.count_flops(torch.randn(2, 8))
+        self.assertTrue(torch.equal(mod[1].running_mean, running_mean))
+        self.assertEqual(mod[1].num_batches_tracked.item(), 0)
+        self.assertTrue(torch.equal(torch.get_rng_state(), rng_state))
+
+    def test_signature(self):
+        x = torch.randn(2, 8)
+        _, bwd_flops = self.accountant.count_flops(x)
+        self.assertGreater(bwd_flops, 0)
+
+        self.mod.weight.requires_grad_(False)
+        self.assertEqual(self.accountant.count_flops(x), (128, 0))
+        self.mod.weight.requires_grad_(True)
+
+        with torch.no_grad():
+            self.assertEqual(self.accountant.count_flops(x), (128, 0))
+        self.assertEqual(self.accountant.count_flops(x), (128, 128))
+
+    def test_scalar_arguments(self):
+
+        class Repeat(torch.nn.Module):
+
+            def __init__(self):
+                super().__init__()
+                self.linear = torch.nn.Linear(8, 8, bias=False)
+
+            def forward(self, x, num_steps=1):
+                for _ in range(num_steps):
+                    x = self.linear(x)
+                return x
+
+        accountant = FlopAccountant(Repeat(), peak_flops=1e9)
+        x = torch.randn(2, 8)
+        fwd_flops_1, _ = accountant.count_flops(x, num_steps=1)
+        fwd_flops_3, _ = accountant.count_flops(x, num_steps=3)
+        self.assertEqual(fwd_flops_3, 3 * fwd_flops_1)
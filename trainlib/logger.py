@@ -1,4 +1,5 @@
 import logging
+import threading
 import time
 from datetime import timedelta
 from functools import wraps
@@ -6,6 +7,22 @@ from inspect import signature
 
 from colorlog import TTYColoredFormatter
 
+# Stacks of `log_this`-decorated functions that are currently running, keyed by thread id.
+_active_functions = dict()
+
+
+def get_active_function(thread_id=None):
+    """
+    Return the name of the innermost running `log_this`-decorated function in a thread (the current one by default).
+    """
+    if thread_id is None:
+        thread_id = threading.get_ident()
+    stack = _active_functions.get(thread_id)
+    try:
+        return stack[-1]
+    except (TypeError, IndexError):
+        return None
+
 
 def log_this(func=None, *, log_level='DEBUG', msg='', arg_list=None):
     """
@@ -33,7 +50,15 @@ def log_this(func=None, *, log_level='DEBUG', msg='', arg_list=None):
                 arg_msg = {name: eval(name, all_args) for name in new_arg_list}
                 log_func(f'*ARG_LIST* {arg_msg}')
 
-            ret = func(*args, **kwargs)
+            thread_id = threading.get_ident()
+            stack = _active_functions.setdefault(thread_id, list())
+            stack.append(new_msg)
+            try:
+                ret = func(*args, **kwargs)
+            finally:
+                stack.pop()
+                if not stack:
+                    del _active_functions[thread_id]
             log_func(f'*FINISHED* {new_msg}')
             return ret
 
@@ -0,0 +1,193 @@
+"""
+A background sampler of memory usage. Samples are written into ring buffers by a single sampler thread,
+and turned into `Metrics` at report time.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+import threading
+import tracemalloc
+from collections import defaultdict
+from typing import Dict
+
+import numpy as np
+
+from .logger import get_active_function
+from .metrics import Metric, Metrics
+
+try:
+    import resource
+except ImportError:  # Not available on Windows.
+    resource = None
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+_PAGE_SIZE = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+
+def get_rss() -> int:
+    """
+    Return the current resident set size of this process in bytes, or 0 if it is unavailable.
+    `/proc` is used on Linux, and `psutil` (if installed) elsewhere.
+    """
+    try:
+        with open('/proc/self/statm') as fin:
+            return int(fin.read().split()[1]) * _PAGE_SIZE
+    except OSError:
+        pass
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    return 0
+
+
+def get_peak_rss() -> int:
+    """Return the peak resident set size of this process in bytes, or 0 if it is unavailable."""
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # NOTE(j_luo) `ru_maxrss` is in bytes on macOS and in kilobytes elsewhere.
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class RingBuffer:
+    """
+    A fixed-size buffer that keeps the most recent values.
+
+    It has to be written by a single thread. The write index is only advanced after a value is stored,
+    so readers never need a lock. Readers drop the slots that might have been overwritten while they were copying,
+    so at worst they miss the oldest values.
+    """
+
+    def __init__(self, capacity: int):
+        # NOTE(j_luo) One extra slot for the value that might be in the middle of being written.
+        self._data = np.zeros(capacity + 1, dtype=np.int64)
+        self._capacity = capacity
+        self._index = 0
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self):
+        return min(self._index, self.capacity)
+
+    def append(self, value: int):
+        self._data[self._index % len(self._data)] = value
+        self._index += 1
+
+    def values(self) -> np.ndarray:
+        """Return a copy of the stored values, from the oldest to the newest."""
+        end = self._index
+        data = self._data.copy()
+        # Any value written after `end` was read, including one being written right now, has overwritten an old slot.
+        start = max(0, end - self.capacity, self._index + 1 - len(data))
+        return data[np.arange(start, end) % len(data)]
+
+
+class MemorySampler:
+    """
+    Sample memory usage every `interval` seconds in a daemon thread.
+
+    Each sample records process RSS, peak RSS, the number of blocks allocated by Python and,
+    if `trace_malloc` is set, the memory traced by `tracemalloc` (which adds overhead to every allocation).
+    The latest `capacity` samples are kept. Changes in RSS between samples are attributed to the
+    `log_this`-decorated function running in the thread that created the sampler. `deltas` holds the cumulative
+    changes since the sampler started, while `get_metrics` reports the changes since its previous call.
+    """
+
+    fields = ('rss', 'peak_rss', 'py_blocks')
+    traced_fields = ('traced', 'traced_peak')
+
+    def __init__(self, *, interval: float = 1.0, capacity: int = 1024, trace_malloc: bool = False):
+        self.interval = interval
+        self.trace_malloc = trace_malloc
+        fields = self.fields + self.traced_fields if trace_malloc else self.fields
+        self.buffers: Dict[str, RingBuffer] = {field: RingBuffer(capacity) for field in fields}
+        # NOTE(j_luo) Only the sampler thread writes to `deltas`, and only the reader writes to `_reported_deltas`.
+        self.deltas: Dict[str, int] = defaultdict(int)
+        self._reported_deltas: Dict[str, int] = dict()
+        self._started_tracemalloc = False
+
+        self._thread_id = threading.get_ident()
+        self._last_rss = None
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self) -> MemorySampler:
+        # NOTE(j_luo) Ring buffers only support one writer.
+        if self._thread is not None:
+            raise RuntimeError('This memory sampler has already been started.')
+        if self.trace_malloc and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run, name='memory-sampler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        # Only stop tracing if it was started by this sampler.
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stop()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            self.sample()
+            self._stop_event.wait(self.interval)
+
+    def sample(self):
+        """Take one sample. This is called by the sampler thread."""
+        rss = get_rss()
+        values = {
+            'rss': rss,
+            'peak_rss': get_peak_rss(),
+            'py_blocks': sys.getallocatedblocks()
+        }
+        if self.trace_malloc:
+            values['traced'], values['traced_peak'] = tracemalloc.get_traced_memory()
+        for field, value in values.items():
+            self.buffers[field].append(value)
+
+        if self._last_rss is not None:
+            name = get_active_function(self._thread_id) or 'untracked'
+            self.deltas[name] += rss - self._last_rss
+        self._last_rss = rss
+
+    def get_metrics(self) -> Metrics:
+        """
+        Return the latest value of every field, the mean RSS over the buffered samples,
+        and the RSS delta attributed to each function since the previous call.
+        """
+        metrics = list()
+        for field, buffer in self.buffers.items():
+            values = buffer.values()
+            if len(values):
+                metrics.append(Metric(f'mem_{field}', int(values[-1]), 1))
+                if field == 'rss':
+                    metrics.append(Metric('mem_rss_mean', float(values.mean()), 1))
+        deltas = defaultdict(int)
+        for name, total in list(self.deltas.items()):
+            # Function labels are free-form text, but metric names should be attribute-accessible.
+            deltas[re.sub(r'\W', '_', name)] += total - self._reported_deltas.get(name, 0)
+            self._reported_deltas[name] = total
+        for name, delta in deltas.items():
+            if delta:
+                metrics.append(Metric(f'mem_delta_{name}', delta, 0, report_mean=False))
+        return Metrics(*metrics)
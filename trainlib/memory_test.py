@@ -0,0 +1,76 @@
+import threading
+import time
+import tracemalloc
+from unittest import TestCase, skipIf
+
+from .logger import _active_functions, get_active_function, log_this
+from .memory import MemorySampler, RingBuffer, get_rss
+
+rss_unavailable = skipIf(get_rss() == 0, 'RSS is not available on this platform.')
+
+
+class TestRingBuffer(TestCase):
+
+    def test_append(self):
+        buffer = RingBuffer(3)
+        self.assertEqual(len(buffer), 0)
+        for i in range(5):
+            buffer.append(i)
+        self.assertEqual(len(buffer), 3)
+        self.assertListEqual(buffer.values().tolist(), [2, 3, 4])
+
+
+class TestMemorySampler(TestCase):
+
+    @rss_unavailable
+    def test_get_metrics(self):
+        with MemorySampler(interval=0.01, trace_malloc=True) as sampler:
+            time.sleep(0.1)
+        metrics = sampler.get_metrics()
+        self.assertGreater(metrics.mem_rss.value, 0)
+        self.assertGreaterEqual(metrics.mem_peak_rss.value, metrics.mem_rss.value)
+        self.assertGreater(metrics.mem_py_blocks.value, 0)
+        self.assertGreater(metrics.mem_traced.value, 0)
+
+    @rss_unavailable
+    def test_attribution(self):
+
+        @log_this(msg='allocate memory')
+        def allocate():
+            # Touch every page so that RSS actually grows.
+            x = b'\x01' * (64 * 1024 * 1024)
+            time.sleep(0.1)
+            return x
+
+        with MemorySampler(interval=0.01) as sampler:
+            time.sleep(0.05)
+            x = allocate()
+        self.assertIn('allocate memory', sampler.deltas)
+        self.assertGreater(sampler.deltas['allocate memory'], 0)
+        self.assertGreater(sampler.get_metrics().mem_delta_allocate_memory.total, 0)
+        # Deltas are only reported once.
+        with self.assertRaises(AttributeError):
+            sampler.get_metrics().mem_delta_allocate_memory
+        self.assertIsNone(get_active_function())
+        self.assertNotIn(threading.get_ident(), _active_functions)
+
+    def test_without_trace_malloc(self):
+        with MemorySampler(interval=0.01) as sampler:
+            time.sleep(0.05)
+        metrics = sampler.get_metrics()
+        with self.assertRaises(AttributeError):
+            metrics.mem_traced
+
+    def test_keep_user_tracemalloc(self):
+        tracemalloc.start()
+        try:
+            with MemorySampler(interval=0.01, trace_malloc=True):
+                time.sleep(0.05)
+            self.assertTrue(tracemalloc.is_tracing())
+        finally:
+            tracemalloc.stop()
+
+    def test_start_twice(self):
+        with MemorySampler(interval=0.01) as sampler:
+            with self.assertRaises(RuntimeError):
+                sampler.start()
@@ -1,4 +1,5 @@
 import logging
+import threading
 
 import numpy as np
 import torch
@@ -62,6 +63,9 @@ class Metric:
     def __radd__(self, other):
         return self.__add__(other)
 
+    def copy(self):
+        return Metric(self.name, self._v, self._w, report_mean=self.report_mean)
+
     def rename(self, name):
         '''This is in-place.'''
         self.name = name
@@ -143,6 +147,9 @@ class Metrics:
         except KeyError:
             raise AttributeError(f'Cannot find this attribute {key}')
 
+    def copy(self):
+        return Metrics(*[m.copy() for m in self._metrics.values()])
+
     def get_table(self, title=''):
         t = pt()
         if title:
@@ -157,3 +164,83 @@ class Metrics:
     def clear(self):
         for m in self._metrics.values():
             m.clear()
+
+
+class ConcurrentMetrics:
+    """
+    Accumulate metrics from multiple threads without locks on the write path.
+
+    Every thread writes to its own shard by rebinding it to a new `Metrics` object, and never mutates a published one.
+    Readers therefore see a consistent value of each shard without taking a lock. Clearing does not touch the shards:
+    instead, readers remember what they have already consumed from each shard and only report the difference.
+    The global lock is only taken once per thread to register its shard, and by readers.
+    """
+
+    def __init__(self):
+        self._local = threading.local()
+        self._shards = list()
+        self._lock = threading.Lock()
+
+    def _get_shard(self):
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    def add(self, metrics):
+        """Add a copy of `metrics` (either a `Metric` or a `Metrics` instance) to the shard of the current thread."""
+        shard = self._get_shard()
+        shard.metrics = shard.metrics + metrics.copy()
+
+    def __iadd__(self, metrics):
+        self.add(metrics)
+        return self
+
+    def _collect(self, clear):
+        ret = Metrics()
+        with self._lock:
+            for shard in self._shards:
+                metrics = shard.metrics
+                ret = ret + _get_delta(metrics, shard.consumed)
+                if clear:
+                    shard.consumed = metrics
+        return ret
+
+    def snapshot(self) -> Metrics:
+        """Merge everything added since the last clear into a new `Metrics` instance."""
+        return self._collect(False)
+
+    def snapshot_and_clear(self) -> Metrics:
+        """
+        Same as `snapshot`, but also clear. This is safe while other threads are adding:
+        every addition ends up either in the returned value or in a later snapshot.
+        """
+        return self._collect(True)
+
+    def clear(self):
+        self._collect(True)
+
+
+class _Shard:
+
+    def __init__(self):
+        # NOTE(j_luo) `metrics` is only rebound by the owner thread, and `consumed` only by readers.
+        self.metrics = Metrics()
+        self.consumed = Metrics()
+
+
+def _get_delta(metrics, consumed):
+    """Return new `Metrics` with what `metrics` has accumulated on top of `consumed`."""
+    consumed = dict(consumed.items())
+    delta = list()
+    for name, metric in metrics.items():
+        base = consumed.get(name)
+        if base is None:
+            delta.append(metric.copy())
+        # NOTE(j_luo) Metrics that have not been added to since are the very same objects.
+        elif metric is not base:
+            delta.append(Metric(name, metric.value - base.value, metric._w - base._w, report_mean=metric.report_mean))
+    return Metrics(*delta)
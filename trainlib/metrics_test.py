@@ -0,0 +1,77 @@
+import threading
+from unittest import TestCase
+
+from .metrics import ConcurrentMetrics, Metric, Metrics
+
+
+class TestConcurrentMetrics(TestCase):
+
+    def test_single_thread(self):
+        metrics = ConcurrentMetrics()
+        metrics.add(Metric('loss', 2.0, 1))
+        metrics += Metrics(Metric('loss', 4.0, 1), Metric('acc', 1, 2))
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot.loss.value, 6.0)
+        self.assertEqual(snapshot.loss.weight, 2)
+        self.assertEqual(snapshot.acc.value, 1)
+
+    def test_multiple_threads(self):
+        metrics = ConcurrentMetrics()
+
+        def work():
+            for _ in range(1000):
+                metrics.add(Metric('cnt', 1, 1))
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot.cnt.value, 8000)
+        self.assertEqual(snapshot.cnt.weight, 8000)
+
+    def test_clear(self):
+        metrics = ConcurrentMetrics()
+        metrics.add(Metric('loss', 2.0, 1))
+        metrics.clear()
+        self.assertEqual(repr(metrics.snapshot()), 'Metrics()')
+
+    def test_copies(self):
+        metrics = ConcurrentMetrics()
+        loss = Metric('loss', 2.0, 1)
+        metrics.add(loss)
+        loss.clear()
+        snapshot = metrics.snapshot()
+        self.assertEqual(snapshot.loss.value, 2.0)
+
+        snapshot.clear()
+        self.assertEqual(metrics.snapshot().loss.value, 2.0)
+
+    def test_snapshot_and_clear(self):
+        metrics = ConcurrentMetrics()
+        stop = threading.Event()
+        counts = list()
+
+        def work():
+            cnt = 0
+            while not stop.is_set():
+                metrics.add(Metric('cnt', 1, 1))
+                cnt += 1
+            counts.append(cnt)
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        total = 0
+        for _ in range(100):
+            snapshot = metrics.snapshot_and_clear()
+            if 'cnt' in dict(snapshot.items()):
+                total += snapshot.cnt.value
+        stop.set()
+        for thread in threads:
+            thread.join()
+        snapshot = metrics.snapshot_and_clear()
+        if 'cnt' in dict(snapshot.items()):
+            total += snapshot.cnt.value
+        self.assertEqual(total, sum(counts))
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import multiprocessing as mp
+import os
 import time
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List
@@ -11,6 +13,73 @@ class PBarOutOfBound(Exception):
     pass
 
 
+def is_main_process() -> bool:
+    """Return whether this is the rank-0 process of a (possibly) multi-process run."""
+    return int(os.environ.get('RANK', 0)) == 0
+
+
+class SharedCounter:
+    """
+    A counter stored in shared memory. It can be handed to DataLoader workers or other subprocesses
+    (through inheritance or process arguments), and incremented there without sending any messages back.
+
+    Every `increment` call takes a cross-process lock. Workers should therefore count locally and
+    add in batches, either by calling `increment(n)` themselves or through `batched`:
+
+        with counter.batched(flush_every=64) as local:
+            for item in items:
+                ...
+                local.increment()
+
+    `ctx` is the multiprocessing context used to create the shared value. It has to match the start method of the
+    processes it is handed to, e.g., `mp.get_context('spawn')` for a DataLoader with `multiprocessing_context='spawn'`.
+    """
+
+    def __init__(self, *, ctx=None):
+        ctx = ctx or mp.get_context()
+        self._value = ctx.Value('q', 0)
+
+    @property
+    def value(self) -> int:
+        return self._value.value
+
+    def increment(self, n: int = 1):
+        with self._value.get_lock():
+            self._value.value += n
+
+    def reset(self):
+        with self._value.get_lock():
+            self._value.value = 0
+
+    def batched(self, flush_every: int = 64) -> BatchedCounter:
+        return BatchedCounter(self, flush_every=flush_every)
+
+
+class BatchedCounter:
+    """A process-local buffer in front of a `SharedCounter` that takes the shared lock every `flush_every` items."""
+
+    def __init__(self, counter: SharedCounter, *, flush_every: int = 64):
+        self._counter = counter
+        self._flush_every = flush_every
+        self._pending = 0
+
+    def increment(self, n: int = 1):
+        self._pending += n
+        if self._pending >= self._flush_every:
+            self.flush()
+
+    def flush(self):
+        if self._pending:
+            self._counter.increment(self._pending)
+            self._pending = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.flush()
+
+
 class BaseTrackable(ABC):
 
     def __init__(self, name: str, *, parent: BaseTrackable = None):
@@ -45,7 +114,8 @@ class BaseTrackable(ABC):
 
 class CountTrackable(BaseTrackable):
 
-    _manager = enlighten.get_manager()
+    # NOTE(j_luo) Only rank 0 draws progress bars. Other processes still keep counts.
+    _manager = enlighten.get_manager(enabled=is_main_process())
 
     def __init__(self, name: str, total: int, *, parent: BaseTrackable = None):
         super().__init__(name, parent=parent)
@@ -55,7 +125,7 @@ class CountTrackable(BaseTrackable):
 
     @classmethod
     def reset_all(cls):
-        cls._manager = enlighten.get_manager()
+        cls._manager = enlighten.get_manager(enabled=is_main_process())
 
     @property
     def total(self):
@@ -78,6 +148,41 @@ class CountTrackable(BaseTrackable):
         return self._pbar.count
 
 
+class SharedCountTrackable(CountTrackable):
+    """
+    A count trackable whose count lives in a `SharedCounter`. Other processes increment `counter`,
+    and `update` pulls the aggregated count into the progress bar in the main process.
+    """
+
+    def __init__(self, name: str, total: int, *, parent: BaseTrackable = None, ctx=None):
+        super().__init__(name, total, parent=parent)
+
+        self._counter = SharedCounter(ctx=ctx)
+
+    @property
+    def counter(self) -> SharedCounter:
+        return self._counter
+
+    def update(self) -> bool:
+        delta = self._counter.value - self._pbar.count
+        if delta <= 0:
+            return False
+        self._pbar.update(delta)
+        if self._total is not None and self._pbar.count > self._total:
+            raise PBarOutOfBound(f'Progress bar ran out of bound.')
+        for trackable in self.children:
+            trackable.reset()
+        return True
+
+    def reset(self):
+        self._counter.reset()
+        super().reset()
+
+    @property
+    def value(self):
+        return self._counter.value
+
+
 class MaxTrackable(BaseTrackable):
 
     def __init__(self, name: str, *, parent: BaseTrackable = None):
@@ -106,15 +211,19 @@ class TrackableFactory:
 
     _instances: Dict[str, BaseTrackable] = dict()
 
-    def __new__(cls, name: str, *, total: int = None, parent: BaseTrackable = None, agg_func: str = 'count'):
+    def __new__(cls, name: str, *, total: int = None, parent: BaseTrackable = None, agg_func: str = 'count',
+                ctx=None):
         """
         If `parent` is set, then this trackable will be reset whenever the parent is updated.
+        `ctx` is the multiprocessing context for shared trackables.
         """
         if name in cls._instances:
             raise ValueError(f'A trackable named "{name}" already exists.')
 
         if agg_func == 'count':
             obj = CountTrackable(name, total, parent=parent)
+        elif agg_func == 'shared_count':
+            obj = SharedCountTrackable(name, total, parent=parent, ctx=ctx)
         elif agg_func == 'max':
             obj = MaxTrackable(name, parent=parent)
         else:
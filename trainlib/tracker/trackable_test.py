@@ -1,6 +1,14 @@
+import multiprocessing as mp
 from unittest import TestCase
 
-from .trackable import PBarOutOfBound, CountTrackable, reset_all, MaxTrackable
+from .trackable import (CountTrackable, MaxTrackable, PBarOutOfBound,
+                        SharedCountTrackable, reset_all)
+
+
+def _increment(counter, n):
+    with counter.batched(flush_every=7) as local:
+        for _ in range(n):
+            local.increment()
 
 
 class TestCountTrackable(TestCase):
@@ -58,3 +66,51 @@ class TestMaxTrackable(TestCase):
             x.update(i)
         x.reset()
         self.assertEqual(x.value, -float('inf'))
+
+
+class TestSharedCountTrackable(TestCase):
+
+    def setUp(self):
+        reset_all()
+
+    def test_update(self):
+        x = SharedCountTrackable('sample', total=400)
+        procs = [mp.Process(target=_increment, args=(x.counter, 100)) for _ in range(4)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        self.assertEqual(x.value, 400)
+        self.assertTrue(x.update())
+        self.assertFalse(x.update())
+
+        x.counter.increment()
+        with self.assertRaises(PBarOutOfBound):
+            x.update()
+
+    def test_reset(self):
+        x = SharedCountTrackable('sample', total=10)
+        x.counter.increment(5)
+        x.update()
+        x.reset()
+        self.assertEqual(x.value, 0)
+
+    def test_batched(self):
+        x = SharedCountTrackable('sample', total=10)
+        local = x.counter.batched(flush_every=4)
+        for _ in range(3):
+            local.increment()
+        self.assertEqual(x.value, 0)
+        local.increment()
+        self.assertEqual(x.value, 4)
+        local.increment()
+        local.flush()
+        self.assertEqual(x.value, 5)
+
+    def test_spawn_context(self):
+        ctx = mp.get_context('spawn')
+        x = SharedCountTrackable('sample', total=20, ctx=ctx)
+        proc = ctx.Process(target=_increment, args=(x.counter, 20))
+        proc.start()
+        proc.join()
+        self.assertEqual(x.value, 20)
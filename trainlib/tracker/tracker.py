@@ -4,6 +4,7 @@ A Tracker instance is responsible for:
 2. tracking some curriculum- or annealing-related hyperparameters.
 3. tracking metrics.
 4. displaying a progress bar (through trackables.)
+5. sampling memory usage (through a MemorySampler.)
 """
 
 from __future__ import annotations
@@ -12,7 +13,10 @@ import random
 from dataclasses import dataclass
 from typing import Any, Dict, List, Sequence
 
-from .trackable import (BaseTrackable, MaxTrackable, TrackableFactory,
+from ..memory import MemorySampler
+from ..metrics import Metrics
+from .trackable import (BaseTrackable, MaxTrackable, SharedCounter,
+                        SharedCountTrackable, TrackableFactory,
                         TrackableUpdater)
 
 
@@ -33,6 +37,8 @@ class Tracker:
 
         self.trackables: Dict[str, BaseTrackable] = dict()
 
+        self.memory_sampler: MemorySampler = None
+
     def is_finished(self, name: str):
         return self.trackables[name].value >= self.trackables[name].total
 
@@ -44,6 +50,40 @@ class Tracker:
     def add_max_trackable(self, name: str) -> MaxTrackable:
         return self.add_trackable(name, agg_func='max')
 
+    def add_shared_trackable(self, name: str, *, total: int = None, ctx=None) -> SharedCountTrackable:
+        """`ctx` is the multiprocessing context of the worker processes that increment this trackable."""
+        trackable = TrackableFactory(name, total=total, agg_func='shared_count', ctx=ctx)
+        self.trackables[name] = trackable
+        return trackable
+
+    def get_counter(self, name: str) -> SharedCounter:
+        """Return the shared counter of a trackable, to be incremented by worker processes."""
+        return self.trackables[name].counter
+
+    def sync(self):
+        """Pull counts from all shared trackables and refresh their progress bars."""
+        for trackable in self.trackables.values():
+            if isinstance(trackable, SharedCountTrackable):
+                trackable.update()
+
+    def start_memory_sampler(self, *, interval: float = 1.0, capacity: int = 1024,
+                             trace_malloc: bool = False) -> MemorySampler:
+        if self.memory_sampler is not None:
+            raise RuntimeError('A memory sampler has already been started.')
+        self.memory_sampler = MemorySampler(interval=interval, capacity=capacity, trace_malloc=trace_malloc).start()
+        return self.memory_sampler
+
+    def stop_memory_sampler(self):
+        if self.memory_sampler is not None:
+            self.memory_sampler.stop()
+            self.memory_sampler = None
+
+    def get_memory_metrics(self) -> Metrics:
+        """Return memory metrics from the sampler, or empty metrics if no sampler is running."""
+        if self.memory_sampler is None:
+            return Metrics()
+        return self.memory_sampler.get_metrics()
+
     def ready(self):
 
         _trackables_to_update = dict()
@@ -1,10 +1,19 @@
+import multiprocessing as mp
+import time
 from collections import Counter
-from unittest import TestCase
+from unittest import TestCase, skipIf
 
+from ..memory import get_rss
 from .trackable import reset_all
 from .tracker import Task, Tracker
 
 
+def _increment(counter, n):
+    with counter.batched() as local:
+        for _ in range(n):
+            local.increment()
+
+
 class TestTracker(TestCase):
 
     def setUp(self):
@@ -59,3 +68,29 @@ class TestTracker(TestCase):
         self.assertEqual(tracker.step, 100)
         self.assertEqual(tracker.best, 200)
         self.assertEqual(tracker.best2, 400)
+
+    def test_shared_trackable(self):
+        tracker = Tracker()
+        epoch = tracker.add_trackable('epoch', total=2)
+        tracker.add_shared_trackable('sample', total=200)
+        epoch.add_trackable('step', total=10)
+        tracker.ready()
+        counter = tracker.get_counter('sample')
+        procs = [mp.Process(target=_increment, args=(counter, 50)) for _ in range(4)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join()
+        tracker.sync()
+        self.assertEqual(tracker.sample, 200)
+        self.assertTrue(tracker.is_finished('sample'))
+
+    @skipIf(get_rss() == 0, 'RSS is not available on this platform.')
+    def test_memory_sampler(self):
+        tracker = Tracker()
+        self.assertEqual(repr(tracker.get_memory_metrics()), 'Metrics()')
+        tracker.start_memory_sampler(interval=0.01)
+        time.sleep(0.05)
+        self.assertGreater(tracker.get_memory_metrics().mem_rss.value, 0)
+        tracker.stop_memory_sampler()
+        self.assertIsNone(tracker.memory_sampler)